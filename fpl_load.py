@@ -1,7 +1,88 @@
 import abc
-
-import pandas as pd
+import functools
+import hashlib
+import shelve
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import orjson
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import requests
+from requests.adapters import HTTPAdapter
+
+# Shared across every loader so connections to the API are pooled and reused.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://", HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=3)
+)
+_SESSION.headers.update({"User-Agent": "dlt-fpl/1.0"})
+
+# ETags and the tables built from each response, used to skip unchanged data.
+CACHE_DIR = Path(__file__).parent / ".fpl_cache"
+# Bump when format_data or cast changes their output, so stale tables are rebuilt.
+CACHE_VERSION = 3
+_CACHE_LOCK = threading.Lock()
+
+
+def _get(url, headers=None):
+    response = _SESSION.get(url, headers=headers, timeout=10)
+    response.raise_for_status()
+    return response
+
+
+def _get_json(url):
+    return orjson.loads(_get(url).content)
+
+
+def aos_to_soa(records):
+    """
+    Transpose a list of records into a dict of columns.
+
+    Args:
+        records (list): Dicts as returned by the API, one per row.
+
+    Returns:
+        dict: A list of values per key, with None where a record lacks the key.
+    """
+    keys = dict.fromkeys(key for record in records for key in record)
+    return {key: [record.get(key) for record in records] for key in keys}
+
+
+def cast_float32(column):
+    """
+    Cast a float64 column to float32, refusing values outside float32's range.
+
+    Args:
+        column (pa.ChunkedArray): The column to cast.
+
+    Returns:
+        pa.ChunkedArray: The float32 column.
+
+    Raises:
+        pa.ArrowInvalid: If a finite value would overflow to infinity.
+    """
+    result = column.cast(pa.float32())
+    if pc.sum(pc.is_inf(result)).as_py() != pc.sum(pc.is_inf(column)).as_py():
+        raise pa.ArrowInvalid(f"Float value not in float32 range: {column.type}")
+    return result
+
+
+def load_many(loaders, max_workers=16):
+    """
+    Run get_data on several loaders concurrently.
+
+    Args:
+        loaders (list): FPLDataLoader instances, e.g. one PicksLoader per entry.
+        max_workers (int): The maximum number of requests in flight at once.
+
+    Returns:
+        list: The result of each loader's get_data, in the order given.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda loader: loader.get_data(), loaders))
 
 
 class FPLDataLoader:
@@ -11,43 +92,89 @@ class FPLDataLoader:
 
     __metaclass__ = abc.ABCMeta
 
+    # Column dtypes applied to the formatted table, to parse the numeric fields
+    # the API returns as strings and to narrow integer columns with a bounded
+    # range. Other integer columns stay int64, as counts, ranks and epochs grow.
+    dtypes = {}
+
     def __init__(self):
         self.base_url = "https://fantasy.premierleague.com/api/"
         self.url = None
         self.json = None
+        self.etag = None
 
     @property
-    def url(self):
-        return self._url
-
-    @url.setter
-    def url(self, url):
-        self._url = url
+    def cache_key(self):
+        # several loaders read the same url, so key on the loader type too
+        return f"v{CACHE_VERSION}:{type(self).__name__}:{self.url}"
 
     @property
-    def json(self):
-        return self._json
-
-    @json.setter
-    def json(self, json):
-        self._json = json
+    def cache_path(self):
+        digest = hashlib.sha1(self.cache_key.encode()).hexdigest()
+        return CACHE_DIR / f"{digest}.parquet"
 
     @abc.abstractmethod
     def request_data(self):
-        self.json = requests.get(self.url).json()
+        headers = {}
+        if self.cache_path.exists():
+            with _CACHE_LOCK, shelve.open(str(CACHE_DIR / "etags")) as etags:
+                etag = etags.get(self.cache_key)
+            if etag:
+                headers["If-None-Match"] = etag
+        response = _get(self.url, headers=headers)
+        if response.status_code == 304:
+            # unchanged upstream, get_data reads the cached table instead
+            self.json = None
+            return
+        self.json = orjson.loads(response.content)
+        self.etag = response.headers.get("ETag")
 
     @abc.abstractmethod
     def format_request(self) -> str:
-        self.data = pd.DataFrame(self.json)
+        self.data = self.json
 
     @abc.abstractmethod
-    def format_data(self) -> pd.DataFrame:
-        return pd.DataFrame(self.data)
+    def format_data(self) -> pa.Table:
+        return pa.table(aos_to_soa(self.data))
+
+    @staticmethod
+    def add_columns(table: pa.Table, **columns) -> pa.Table:
+        # typed explicitly, an empty response would otherwise give a null column
+        for name, value in columns.items():
+            column = pa.array([value] * table.num_rows, type=pa.int64())
+            table = table.append_column(name, column)
+        return table
+
+    def cast(self, table: pa.Table) -> pa.Table:
+        for name, dtype in self.dtypes.items():
+            if name in table.column_names:
+                index = table.schema.get_field_index(name)
+                table = table.set_column(index, name, table[name].cast(dtype))
+        # float precision beyond float32 is not needed for any FPL stat
+        for index, field in enumerate(table.schema):
+            if field.type == pa.float64():
+                column = cast_float32(table.column(index))
+                table = table.set_column(index, field.name, column)
+        return table
+
+    def save_cache(self, table: pa.Table):
+        CACHE_DIR.mkdir(exist_ok=True)
+        pq.write_table(table, self.cache_path)
+        with _CACHE_LOCK, shelve.open(str(CACHE_DIR / "etags")) as etags:
+            etags[self.cache_key] = self.etag
+
+    def build_table(self) -> pa.Table:
+        self.format_request()
+        return self.cast(self.format_data())
 
     def get_data(self):
         self.request_data()
-        self.format_request()
-        return self.format_data()
+        if self.json is None:
+            return pq.read_table(self.cache_path)
+        table = self.build_table()
+        if self.etag:
+            self.save_cache(table)
+        return table
 
 
 class StandingsLoader(FPLDataLoader):
@@ -57,7 +184,7 @@ class StandingsLoader(FPLDataLoader):
     Attributes:
         league_id (int): The ID of the league.
 
-    DataFrame Columns:
+    Table Columns:
         - id
         - event_total
         - player_name
@@ -77,10 +204,9 @@ class StandingsLoader(FPLDataLoader):
     def format_request(self):
         self.data = self.json["standings"]["results"]
 
-    def format_data(self) -> pd.DataFrame:
-        df = pd.DataFrame(self.data)
-        df['league_id'] = self.league_id
-        return df
+    def format_data(self) -> pa.Table:
+        table = pa.table(aos_to_soa(self.data))
+        return self.add_columns(table, league_id=self.league_id)
 
 
 class HistoryLoader(FPLDataLoader):
@@ -90,7 +216,7 @@ class HistoryLoader(FPLDataLoader):
     Attributes:
         entry_id (int): The ID of the entry.
 
-    DataFrame Columns:
+    Table Columns:
         - event
         - points
         - total_points
@@ -105,6 +231,17 @@ class HistoryLoader(FPLDataLoader):
         - entry
     """
 
+    dtypes = {
+        "event": "int32",
+        "points": "int32",
+        "total_points": "int32",
+        "bank": "int32",
+        "value": "int32",
+        "event_transfers": "int32",
+        "event_transfers_cost": "int32",
+        "points_on_bench": "int32",
+    }
+
     def __init__(self, entry_id):
         super().__init__()
         self.entry_id = entry_id
@@ -114,9 +251,8 @@ class HistoryLoader(FPLDataLoader):
         self.data = self.json["current"]
 
     def format_data(self):
-        df = pd.DataFrame(self.data)
-        df["entry"] = self.entry_id
-        return df
+        table = pa.table(aos_to_soa(self.data))
+        return self.add_columns(table, entry=self.entry_id)
 
 
 class PicksLoader(FPLDataLoader):
@@ -126,10 +262,16 @@ class PicksLoader(FPLDataLoader):
     Attributes:
         entry_id (int): The ID of the entry.
 
-    DataFrame Columns:
+    Table Columns:
         - Various columns related to entry picks.
     """
 
+    dtypes = {
+        "element": "int32",
+        "position": "int32",
+        "multiplier": "int32",
+    }
+
     def __init__(self, entry_id, event_id):
         super().__init__()
         self.entry_id = entry_id
@@ -140,20 +282,19 @@ class PicksLoader(FPLDataLoader):
         self.data = self.json["picks"]
 
     def format_data(self):
-        df = pd.DataFrame(self.data)
-        df["entry"] = self.entry_id
-        df["event"] = self.event_id
-        return df
+        table = pa.table(aos_to_soa(self.data))
+        return self.add_columns(table, entry=self.entry_id, event=self.event_id)
 
 
 class ElementFixturesLoader(FPLDataLoader):
     """
     Class for loading player fixtures data from the Fantasy Premier League API.
+    Use ElementSummaryLoader when history is needed too, to make one request.
 
     Attributes:
         element_id (int): The ID of the player.
 
-    DataFrame Columns:
+    Table Columns:
         - Various columns related to player fixtures.
     """
 
@@ -166,22 +307,40 @@ class ElementFixturesLoader(FPLDataLoader):
         self.data = self.json["fixtures"]
 
     def format_data(self):
-        df = pd.DataFrame(self.data)
-        df["element_id"] = self.element_id
-        return df
+        table = pa.table(aos_to_soa(self.data))
+        return self.add_columns(table, element_id=self.element_id)
 
 
 class ElementHistoryLoader(FPLDataLoader):
     """
     Class for loading player history data from the Fantasy Premier League API.
+    Use ElementSummaryLoader when fixtures are needed too, to make one request.
 
     Attributes:
         element_id (int): The ID of the player.
 
-    DataFrame Columns:
+    Table Columns:
         - Various columns related to player history.
     """
 
+    dtypes = {
+        "influence": "float32",
+        "creativity": "float32",
+        "threat": "float32",
+        "ict_index": "float32",
+        "expected_goals": "float32",
+        "expected_assists": "float32",
+        "expected_goal_involvements": "float32",
+        "expected_goals_conceded": "float32",
+        "element": "int32",
+        "fixture": "int32",
+        "opponent_team": "int32",
+        "total_points": "int32",
+        "round": "int32",
+        "minutes": "int32",
+        "value": "int32",
+    }
+
     def __init__(self, element_id):
         super().__init__()
         self.element_id = element_id
@@ -191,16 +350,53 @@ class ElementHistoryLoader(FPLDataLoader):
         self.data = self.json["history"]
 
     def format_data(self):
-        df = pd.DataFrame(self.data)
-        df["element_id"] = self.element_id
-        return df
+        table = pa.table(aos_to_soa(self.data))
+        return self.add_columns(table, element_id=self.element_id)
+
+
+class ElementSummaryLoader(FPLDataLoader):
+    """
+    Class for loading player fixtures and history data from the Fantasy Premier
+    League API in a single request.
+
+    Attributes:
+        element_id (int): The ID of the player.
+
+    Table Columns:
+        - Returns a dict of tables keyed by "fixtures" and "history", see
+          ElementFixturesLoader and ElementHistoryLoader.
+    """
+
+    slice_loaders = {
+        "fixtures": ElementFixturesLoader,
+        "history": ElementHistoryLoader,
+    }
+
+    def __init__(self, element_id):
+        super().__init__()
+        self.element_id = element_id
+        self.url = self.base_url + f"element-summary/{element_id}/"
+
+    def request_data(self):
+        # one response builds two tables, so the single-table ETag cache
+        # in FPLDataLoader does not apply here
+        self.json = _get_json(self.url)
+
+    def get_data(self):
+        self.request_data()
+        tables = {}
+        for key, loader_class in self.slice_loaders.items():
+            loader = loader_class(self.element_id)
+            loader.json = self.json
+            tables[key] = loader.build_table()
+        return tables
 
 
 class BootstrapLoader(FPLDataLoader):
     """
     Class for loading general player data from the Fantasy Premier League API.
 
-    DataFrame Columns:
+    Table Columns:
         - Various columns related to general player data.
     """
 
@@ -208,18 +404,29 @@ class BootstrapLoader(FPLDataLoader):
         self.base_url = "https://fantasy.premierleague.com/api/"
         self.url = self.base_url + "bootstrap-static/"
         self.data = None
+        self.etag = None
         self.json = self.fetch_data()
 
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _cached_json(url):
+        # shared by every subclass, so bootstrap-static is only requested once
+        return _get_json(url)
+
     def fetch_data(self):
-        response = requests.get(self.url)
-        return response.json()
+        return self._cached_json(self.url)
+
+    def request_data(self):
+        # one bootstrap-static response feeds every subclass in the run, so
+        # these loaders skip the per-loader ETag cache in FPLDataLoader
+        self.json = self.fetch_data()
 
 
 class EventsLoader(BootstrapLoader):
     """
     Class for loading eve
 
-    DataFrame Columns:
+    Table Columns:
         - id
         - name
         - deadline_time
@@ -241,7 +448,8 @@ class EventsLoader(BootstrapLoader):
         - most_selected
         - most_transferred_in
         - top_element
-        - top_element_info
+        - top_element_info.id
+        - top_element_info.points
         - transfers_made
         - most_captained
         - most_vice_captained
@@ -250,12 +458,16 @@ class EventsLoader(BootstrapLoader):
     def format_request(self):
         self.data = self.json["events"]
 
+    def format_data(self):
+        # top_element_info is a nested object, flatten it into its own columns
+        return pa.table(aos_to_soa(self.data)).flatten()
+
 
 class PhasesLoader(BootstrapLoader):
     """
     Class for loading phase data from the Fantasy Premier League API.
 
-    DataFrame Columns:
+    Table Columns:
         - id
         - name
         - start_event
@@ -271,7 +483,7 @@ class TeamsLoader(BootstrapLoader):
     """
     Class for loading team data from the Fantasy Premier League API.
 
-    DataFrame Columns:
+    Table Columns:
         - code
         - draw
         - form
@@ -303,7 +515,7 @@ class TotalPlayersLoader(BootstrapLoader):
     """
     Class for loading the total number of players from the Fantasy Premier League API.
 
-    DataFrame Columns:
+    Table Columns:
         - total_players
     """
 
@@ -311,15 +523,14 @@ class TotalPlayersLoader(BootstrapLoader):
         self.data = self.json["total_players"]
 
     def format_data(self):
-        df = pd.DataFrame([{"total_players": self.data}])
-        return df
+        return pa.table({"total_players": [self.data]})
 
 
 class ElementsLoader(BootstrapLoader):
     """
     Class for loading player element data from the Fantasy Premier League API.
 
-    DataFrame Columns:
+    Table Columns:
         - chance_of_playing_next_round
         - chance_of_playing_this_round
         - code
@@ -411,6 +622,26 @@ class ElementsLoader(BootstrapLoader):
         - clean_sheets_per_90
     """
 
+    dtypes = {
+        "ep_next": "float32",
+        "ep_this": "float32",
+        "form": "float32",
+        "points_per_game": "float32",
+        "selected_by_percent": "float32",
+        "value_form": "float32",
+        "value_season": "float32",
+        "influence": "float32",
+        "creativity": "float32",
+        "threat": "float32",
+        "ict_index": "float32",
+        "expected_goals": "float32",
+        "expected_assists": "float32",
+        "expected_goal_involvements": "float32",
+        "expected_goals_conceded": "float32",
+        "now_cost": "int32",
+        "total_points": "int32",
+    }
+
     def format_request(self):
         self.data = self.json["elements"]
 
@@ -419,7 +650,7 @@ class ElementStatsLoader(BootstrapLoader):
     """
     Class for loading element statistics data from the Fantasy Premier League API.
 
-    DataFrame Columns:
+    Table Columns:
         - label
         - name
     """
@@ -432,7 +663,7 @@ class ElementTypesLoader(BootstrapLoader):
     """
     Class for loading element type data from the Fantasy Premier League API.
 
-    DataFrame Columns:
+    Table Columns:
         - id
         - plural_name
         - plural_name_short
@@ -21,11 +21,6 @@ def fpl_source():
         "resource_defaults": {
             # "primary_key": "id",
             "write_disposition": "replace",
-            "endpoint": {
-                "params": {
-                    "per_page": 100,
-                },
-            },
         },
         "resources": [
             {
@@ -1,51 +1,90 @@
+import functools
+
 import dlt
+import ijson
 from dlt.sources.helpers.rest_client import RESTClient
 
 # api url
 base_url = "https://fantasy.premierleague.com/api/"
 bootstrap_url = base_url + "bootstrap-static/"
 
+# classic leagues to load standings for
+league_ids = [741068]
+
+# bootstrap-static keys loaded by the resources below
+BOOTSTRAP_KEYS = {
+    "events",
+    "phases",
+    "teams",
+    "total_players",
+    "elements",
+    "element_stats",
+    "element_types",
+}
+
+# number of records yielded to dlt at a time
+BATCH_SIZE = 500
+
 
 fpl_client = RESTClient(base_url)
 
 
-def load_bootstrap_event(key: str):
-    response = fpl_client.get(bootstrap_url)
+@functools.lru_cache(maxsize=1)
+def _bootstrap():
+    # every resource reads from the same payload, so only fetch it once per run
+    response = fpl_client.get(bootstrap_url, stream=True)
     response.raise_for_status()
-    return response.json()[key]
+    response.raw.decode_content = True
+    # stream the body and only build the keys a resource reads
+    with response:
+        return {
+            key: value
+            for key, value in ijson.kvitems(response.raw, "", use_float=True)
+            if key in BOOTSTRAP_KEYS
+        }
+
+
+def load_bootstrap_event(key: str):
+    return _bootstrap()[key]
+
+
+def load_bootstrap_batches(key: str, batch_size: int = BATCH_SIZE):
+    data = load_bootstrap_event(key)
+    for i in range(0, len(data), batch_size):
+        yield data[i : i + batch_size]
 
 
 # Define a resource for the first key
 @dlt.resource(
-    # primary_key="id",
+    primary_key="id",
     table_name="events",
-    write_disposition="replace",
+    write_disposition="merge",
     max_table_nesting=0,
 )
 def events():
-    yield load_bootstrap_event("events")
+    yield from load_bootstrap_batches("events")
 
 
 # Define a resource for the second key
 @dlt.resource(
-    # primary_key="id",
+    primary_key="id",
     table_name="phases",
-    write_disposition="replace",
+    write_disposition="merge",
     max_table_nesting=0,
 )
 def phases():
-    yield load_bootstrap_event("phases")
+    yield from load_bootstrap_batches("phases")
 
 
 # create resources for [teams, total_players, elements, element_stats, element_types]
 @dlt.resource(
-    # primary_key="id",
+    primary_key="id",
     table_name="teams",
-    write_disposition="replace",
+    write_disposition="merge",
     max_table_nesting=0,
 )
 def teams():
-    yield load_bootstrap_event("teams")
+    yield from load_bootstrap_batches("teams")
 
 
 @dlt.resource(
@@ -59,51 +98,65 @@ def total_players():
 
 
 @dlt.resource(
-    # primary_key="id",
+    primary_key="id",
     table_name="elements",
-    write_disposition="replace",
+    write_disposition="merge",
     max_table_nesting=0,
 )
 def elements():
-    yield load_bootstrap_event("elements")
+    yield from load_bootstrap_batches("elements")
 
 
 @dlt.resource(
-    # primary_key="id",
+    primary_key="name",
     table_name="element_stats",
-    write_disposition="replace",
+    write_disposition="merge",
     max_table_nesting=0,
 )
 def element_stats():
-    yield load_bootstrap_event("element_stats")
+    yield from load_bootstrap_batches("element_stats")
 
 
 @dlt.resource(
-    # primary_key="id",
+    primary_key="id",
     table_name="element_types",
-    write_disposition="replace",
+    write_disposition="merge",
     max_table_nesting=0,
 )
 def element_types():
-    yield load_bootstrap_event("element_types")
+    yield from load_bootstrap_batches("element_types")
 
 
-# Create a pipeline and run it
-pipeline = dlt.pipeline(
-    pipeline_name="fpl",
-    destination="duckdb",
-    dataset_name="fpl_data",
-)
-
 @dlt.resource(
-    # primary_key="id",
+    primary_key="id",
     table_name="standings",
     write_disposition="replace",
     max_table_nesting=0,
 )
 def standings():
-    response = fpl_client.get(bootstrap_url)
-    response.raise_for_status() 
+    for league_id in league_ids:
+        page, has_next = 1, True
+        while has_next:
+            response = fpl_client.get(
+                f"leagues-classic/{league_id}/standings/",
+                params={"page_standings": page},
+            )
+            response.raise_for_status()
+            page_data = response.json()["standings"]
+            yield [
+                {**result, "league_id": league_id}
+                for result in page_data["results"]
+            ]
+            has_next = page_data["has_next"]
+            page += 1
+
+
+# Create a pipeline and run it
+pipeline = dlt.pipeline(
+    pipeline_name="fpl",
+    destination="duckdb",
+    dataset_name="fpl_data",
+)
 
 load_info = pipeline.run(
     [
@@ -114,6 +167,7 @@ load_info = pipeline.run(
         elements(),
         element_stats(),
         element_types(),
+        standings(),
     ]
 )
 print(load_info)  # noqa: T201
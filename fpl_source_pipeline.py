@@ -34,11 +34,6 @@ def fpl_source(
         # The default configuration for all resources and their endpoints
         "resource_defaults": {
             "write_disposition": "replace",
-            "endpoint": {
-                "params": {
-                    "per_page": 100,
-                },
-            },
         },
         "resources": [
             # This is a simple resource definition,